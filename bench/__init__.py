@@ -0,0 +1,9 @@
+"""Benchmark suite for the OCR + arithmetic app.
+
+Run from the repository root:
+
+    python -m bench.run                 # all scenarios, compared to bench/baseline.json
+    python -m bench.run --quick         # smaller inputs, for a fast sanity pass
+    python -m bench.run --only parse-1k --only http-webhook-text
+    python -m bench.run --save-baseline # record the current numbers as the new baseline
+"""
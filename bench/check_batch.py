@@ -0,0 +1,93 @@
+"""Property check: the columnar engine (compute_batch) must agree with compute_from_text.
+
+Random slips, salted with malformed and edge-case lines, are computed both
+ways; every line final, section subtotal and grand total must match, as must
+the per-headline totals. tests/test_batch.py runs the same comparison on a
+few small seeds with pytest; this script is for large runs.
+
+    python -m bench.check_batch            # 2000 random slips
+    python -m bench.check_batch --slips 20000 --seed 7
+"""
+import argparse
+import random
+import sys
+
+from bench import slips
+
+EDGE_LINES = [
+    "{12a, 345} = 3 × 2", "{} = 5 × 2", "{123,,456} = 7", "{1 2, 345} = 2 × 3", "{1234,5555}=1×1",
+    "{123} 5", "{123} = 5 ×", "{0012, 111} = 4 × 3", "{123, 4567, 89} = 10",
+    "12 3 = 4", "12 = 3 = 4", "๑๒๓ × 5", "123 × 5 × 6", "-5 = 3", "123 = -4 × 2", "12345 × 2",
+    "1 × 2 = 3", "abc = 5", "= 5", "× 5", "123×5=6=7", "123 = 1_0 × 2", "0012 × 3", "007 = 5",
+    "1234567890123 × 2", "123 = 1234567890 × 2", "99 = 40", "5 = 5", "000 × 1", "1111 = 2 × 3",
+    "123 = 99999999999999999999", "123 × 999999999 = 999999999",
+]
+
+# Slips whose totals overflow int64 even though every line is tidy
+EDGE_SLIPS = [
+    "\n".join(["123 × 999999999 = 999999999"] * 12),
+    "\n".join(["บน", *["123 × 999999999 = 999999999"] * 3, "ล่าง", "45 = 99999999999999999999"]),
+]
+
+
+def salted_slip(rng: random.Random, seed: int) -> str:
+    import app
+    lines = slips.generate_slip(rng.randint(0, 150), seed=seed).split("\n")
+    extras = EDGE_LINES + sorted(app.FULL_TOP_BOTTOM_HEADLINES | app.SINGLE_HEADLINES) + ["", "  "]
+    for _ in range(rng.randint(0, 10)):
+        lines.insert(rng.randint(0, len(lines)), rng.choice(extras))
+    return ("\r\n" if rng.random() < 0.1 else "\n").join(lines)
+
+
+def compare(texts: list) -> list:
+    """Compute ``texts`` both ways; returns a description of every mismatch (empty when they agree)."""
+    import app
+    cols = app._batch_columns(texts)
+    finals, _ = app._batch_finals(cols)
+    batch = app.compute_batch(texts)
+
+    problems = []
+    scalar_finals = []
+    by_headline = {}
+    for i, text in enumerate(texts):
+        ref = app.compute_from_text(text)
+        got = batch["slips"][i]
+        expected_sections = [{"headline": s["headline"], "subtotal": s["subtotal"]} for s in ref["sections"]]
+        if got["grand_total"] != ref["grand_total"] or got["sections"] != expected_sections:
+            problems.append(f"slip {i}: batch {got} != scalar {expected_sections} / {ref['grand_total']}")
+        scalar_finals.extend(li["final"] for s in ref["sections"] for li in s["lines"])
+        for s in ref["sections"]:
+            by_headline[s["headline"]] = by_headline.get(s["headline"], 0) + s["subtotal"]
+
+    if list(map(int, finals)) != scalar_finals:
+        problems.append("per-line finals differ")
+    if batch["grand_total"] != sum(s["grand_total"] for s in batch["slips"]):
+        problems.append("overall total differs from the sum of slip totals")
+    if sum(batch["by_number"].values()) + batch["unattributed"] != batch["grand_total"]:
+        problems.append("per-number totals do not add up to the grand total")
+    if batch["by_headline"] != by_headline:
+        problems.append(f"per-headline totals {batch['by_headline']} != scalar {by_headline}")
+    return problems
+
+
+def check(n_slips: int, seed: int) -> int:
+    rng = random.Random(seed)
+    texts = [salted_slip(rng, seed * 1_000_003 + i) for i in range(n_slips)] + EDGE_SLIPS
+    problems = compare(texts)
+    for problem in problems:
+        print(problem)
+    lines = sum(len(t.splitlines()) for t in texts)
+    print(f"{len(texts)} slips, {lines} text lines: {'OK' if not problems else f'{len(problems)} FAILURES'}")
+    return len(problems)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--slips", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+    return 1 if check(args.slips, args.seed) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
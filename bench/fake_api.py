@@ -0,0 +1,203 @@
+"""Local stand-in for the LINE Messaging API and the Gemini API, for load tests.
+
+One HTTP server answers both: LINE image content, replies and pushes, and
+Gemini ``generateContent`` / ``streamGenerateContent`` with a configurable
+latency, error rate and rate-limit (429) rate. Point the app at it with:
+
+    python -m bench.fake_api --port 8090 --gemini-latency 1.0 --gemini-429 0.05
+    LINE_API_BASE=http://127.0.0.1:8090 LINE_DATA_API_BASE=http://127.0.0.1:8090 \\
+        GEMINI_BASE_URL=http://127.0.0.1:8090 python app.py
+
+``GET /_fake/stats`` reports what the server has seen; ``python -m bench.load``
+runs one in-process and replays webhook traffic against the app.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bench import fixtures, slips
+
+
+def _gemini_body(text: str) -> dict:
+    return {
+        "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP", "index": 0}],
+        "usageMetadata": {"promptTokenCount": 258, "candidatesTokenCount": len(text) // 4},
+        "modelVersion": "gemini-2.0-flash",
+    }
+
+
+def _gemini_error(code: int, status: str, message: str) -> dict:
+    return {"error": {"code": code, "message": message, "status": status}}
+
+
+class FakeApi:
+    """LINE + Gemini stand-in; use as a context manager, ``base_url`` is where it listens.
+
+    Gemini answers with one of ``texts`` (picked at random per call) after
+    ``gemini_latency`` seconds, fails with 500 at ``gemini_error_rate`` and
+    with 429 at ``gemini_429_rate``. Replies are recorded with their arrival
+    time by reply token, pushes in a list.
+    """
+
+    def __init__(self, texts: list, image: bytes, gemini_latency: float = 0.0, gemini_error_rate: float = 0.0,
+                 gemini_429_rate: float = 0.0, line_latency: float = 0.0, host: str = "127.0.0.1", port: int = 0,
+                 seed: int = 0):
+        self.texts = texts
+        self.image = image
+        self.gemini_latency = gemini_latency
+        self.gemini_error_rate = gemini_error_rate
+        self.gemini_429_rate = gemini_429_rate
+        self.line_latency = line_latency
+        self.replies = {}  # reply token -> (time.time() of arrival, first message text)
+        self.pushes = []
+        self.counts = {"content": 0, "gemini": 0, "gemini_500": 0, "gemini_429": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, ctype: str = "application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _json(self, status: int, obj):
+                self._send(status, json.dumps(obj).encode())
+
+            def do_GET(self):
+                if self.path.startswith("/_fake/stats"):
+                    return self._json(200, api.stats())
+                if self.path.startswith("/v2/bot/message/") and self.path.endswith("/content"):
+                    api._count("content")
+                    if api.line_latency:
+                        time.sleep(api.line_latency)
+                    return self._send(200, api.image, "image/png")
+                return self._json(404, {"message": "Not found"})
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                path = self.path.split("?")[0]
+                if path.startswith("/v2/bot/message/"):
+                    if api.line_latency:
+                        time.sleep(api.line_latency)
+                    return api._line(self, path, payload)
+                if ":generateContent" in path or ":streamGenerateContent" in path:
+                    return api._gemini(self, stream=":streamGenerateContent" in path)
+                return self._json(404, {"message": "Not found"})
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def _count(self, key: str):
+        with self._lock:
+            self.counts[key] += 1
+
+    def _line(self, handler, path: str, payload: dict):
+        now = time.time()
+        first = ((payload.get("messages") or [{}])[0]).get("text", "")
+        with self._lock:
+            if path.endswith("/reply"):
+                token = payload.get("replyToken")
+                if token in self.replies:
+                    # LINE rejects a reply token that was already used
+                    return handler._json(400, {"message": "Invalid reply token"})
+                self.replies[token] = (now, first)
+            elif path.endswith("/push"):
+                self.pushes.append((now, payload.get("to"), len(payload.get("messages") or [])))
+            else:
+                return handler._json(404, {"message": "Not found"})
+        return handler._json(200, {})
+
+    def _gemini(self, handler, stream: bool):
+        self._count("gemini")
+        with self._lock:
+            roll = self._rng.random()
+            text = self._rng.choice(self.texts)
+        if roll < self.gemini_429_rate:
+            self._count("gemini_429")
+            return handler._json(429, _gemini_error(429, "RESOURCE_EXHAUSTED", "Resource has been exhausted (e.g. check quota)."))
+        if roll < self.gemini_429_rate + self.gemini_error_rate:
+            time.sleep(self.gemini_latency / 2)
+            self._count("gemini_500")
+            return handler._json(500, _gemini_error(500, "INTERNAL", "An internal error has occurred."))
+        if not stream:
+            time.sleep(self.gemini_latency)
+            return handler._json(200, _gemini_body(text))
+        # Server-sent events, one chunk of lines at a time, spread over the latency
+        lines = text.splitlines(keepends=True)
+        chunks = ["".join(lines[i:i + 5]) for i in range(0, len(lines), 5)] or [""]
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+        for chunk in chunks:
+            time.sleep(self.gemini_latency / len(chunks))
+            event = f"data: {json.dumps(_gemini_body(chunk))}\r\n\r\n".encode()
+            handler.wfile.write(f"{len(event):x}\r\n".encode() + event + b"\r\n")
+        handler.wfile.write(b"0\r\n\r\n")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self.counts, "replies": len(self.replies), "pushes": len(self.pushes)}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def app_env(self) -> dict:
+        """Environment that points the app at this server."""
+        return {"LINE_API_BASE": self.base_url, "LINE_DATA_API_BASE": self.base_url, "GEMINI_BASE_URL": self.base_url}
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def default_api(**kwargs) -> FakeApi:
+    """A FakeApi with 50 distinct 40-line slips and a matching image."""
+    texts = [slips.generate_slip(40, seed=1000 + i) for i in range(50)]
+    return FakeApi(texts, fixtures.make_slip_image(texts[0], scale=2), **kwargs)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8090)
+    ap.add_argument("--gemini-latency", type=float, default=1.0, help="seconds per Gemini call")
+    ap.add_argument("--gemini-errors", type=float, default=0.0, help="fraction of Gemini calls failing with 500")
+    ap.add_argument("--gemini-429", type=float, default=0.0, help="fraction of Gemini calls rejected with 429")
+    ap.add_argument("--line-latency", type=float, default=0.02, help="seconds per LINE API call")
+    args = ap.parse_args(argv)
+    api = default_api(gemini_latency=args.gemini_latency, gemini_error_rate=args.gemini_errors,
+                      gemini_429_rate=args.gemini_429, line_latency=args.line_latency, host=args.host, port=args.port)
+    with api:
+        print(f"Fake LINE + Gemini API on {api.base_url}")
+        for key, value in api.app_env().items():
+            print(f"  {key}={value}")
+        try:
+            while True:
+                time.sleep(10)
+                print(json.dumps(api.stats()))
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
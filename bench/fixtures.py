@@ -0,0 +1,252 @@
+"""Fixtures and fake backends for benchmarks.
+
+Nothing here talks to the network: Gemini and Tesseract are replaced by fakes
+with a controlled latency, and LINE is served by a local HTTP stub.
+"""
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import fitz
+import numpy as np
+from PIL import Image, ImageDraw
+
+
+# ----------------------------- images and PDFs ----------------------------- #
+
+def make_slip_image(text: str, width: int = 800, line_height: int = 28, fmt: str = "PNG", scale: int = 1) -> bytes:
+    """Render slip text as a receipt-style image (one text line per band).
+
+    The bitmap font is ~10px tall; ``scale=2`` gives text the size of a phone screenshot.
+    """
+    lines = text.splitlines() or [""]
+    im = Image.new("RGB", (width, line_height * len(lines) + 40), "white")
+    draw = ImageDraw.Draw(im)
+    for i, line in enumerate(lines):
+        # The default bitmap font has no Thai / × glyphs; shapes are what matter here
+        draw.text((20, 20 + i * line_height), line.replace("×", "x").encode("ascii", "replace").decode(), fill="black")
+    if scale > 1:
+        im = im.resize((im.width * scale, im.height * scale), Image.NEAREST)
+    buf = io.BytesIO()
+    im.save(buf, format=fmt)
+    return buf.getvalue()
+
+
+def make_text_pdf(pages: int, text: str) -> bytes:
+    """A PDF whose pages all carry a text layer."""
+    doc = fitz.open()
+    lines = text.splitlines()
+    per_page = max(1, len(lines) // max(1, pages))
+    for p in range(pages):
+        page = doc.new_page()
+        chunk = "\n".join(lines[p * per_page:(p + 1) * per_page]) or "-"
+        page.insert_text((50, 60), chunk, fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_scanned_pdf(pages: int, text: str) -> bytes:
+    """A PDF whose pages are images only (no text layer), like a scanner produces."""
+    doc = fitz.open()
+    png = make_slip_image("\n".join(text.splitlines()[:40]), width=600)
+    for _ in range(pages):
+        page = doc.new_page()
+        page.insert_image(page.rect, stream=png)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_mixed_pdf(text_pages: int, scanned_pages: int, text: str) -> bytes:
+    doc = fitz.open(stream=make_text_pdf(text_pages, text), filetype="pdf")
+    doc.insert_pdf(fitz.open(stream=make_scanned_pdf(scanned_pages, text), filetype="pdf"))
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+# ----------------------------- fake OCR backends ----------------------------- #
+
+class _FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGeminiClient:
+    """Stands in for ``genai.Client``: sleeps ``latency`` seconds and returns canned text."""
+
+    def __init__(self, text: str, latency: float = 0.0, fail: bool = False, chunk_lines: int = 5):
+        self.text = text
+        self.latency = latency
+        self.fail = fail
+        self.chunk_lines = chunk_lines
+        self.calls = 0
+        self.models = self
+
+    def generate_content(self, model=None, contents=None, **kwargs):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError("fake Gemini failure")
+        return _FakeResponse(self.text)
+
+    def generate_content_stream(self, model=None, contents=None, **kwargs):
+        """Yield the canned text in line chunks, spreading the latency across them.
+
+        Chunk i is released ``(i + 1) / n`` of the way through ``latency`` after
+        the call, as a server generating at a steady rate would; time the
+        consumer spends between chunks overlaps with generation.
+        """
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("fake Gemini failure")
+        lines = self.text.splitlines(keepends=True)
+        chunks = ["".join(lines[i:i + self.chunk_lines]) for i in range(0, len(lines), self.chunk_lines)] or [""]
+        start = time.perf_counter()
+        for i, chunk in enumerate(chunks):
+            ready = start + self.latency * (i + 1) / len(chunks)
+            delay = ready - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            yield _FakeResponse(chunk)
+
+
+class FakeTesseract:
+    """Replacement for ``pytesseract.image_to_string``/``image_to_data``.
+
+    Each call costs ``latency`` seconds (process start-up) plus ``per_megapixel``
+    seconds per megapixel of input, so reading one tall image and reading it in
+    tiles cost about the same CPU. One line of the canned text is reported per
+    run of inked rows in the image. ``install(pytesseract)`` patches both
+    functions.
+    """
+
+    def __init__(self, text: str, latency: float = 0.0, per_megapixel: float = 0.0):
+        self.text = text
+        self.latency = latency
+        self.per_megapixel = per_megapixel
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _read(self, image) -> list:
+        with self._lock:
+            self.calls += 1
+        cost = self.latency + self.per_megapixel * image.width * image.height / 1e6
+        if cost:
+            time.sleep(cost)
+        ink = (np.asarray(image.convert("L")) < 128).any(axis=1)
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], ink.astype(np.int8), [0]))))
+        lines = self.text.splitlines() or [""]
+        return [(int(top), int(bottom), lines[i % len(lines)]) for i, (top, bottom) in enumerate(zip(edges[::2], edges[1::2]))]
+
+    def __call__(self, image, *args, **kwargs):
+        return "\n".join(line for _, _, line in self._read(image))
+
+    def image_to_data(self, image, *args, **kwargs):
+        data = {"text": [], "conf": [], "top": [], "height": []}
+        for top, bottom, line in self._read(image):
+            for word in line.split():
+                data["text"].append(word)
+                data["conf"].append(95.0)
+                data["top"].append(top)
+                data["height"].append(bottom - top)
+        return data
+
+    def install(self, pytesseract_module):
+        pytesseract_module.image_to_string = self
+        pytesseract_module.image_to_data = self.image_to_data
+        return self
+
+
+# ----------------------------- LINE stub ----------------------------- #
+
+class LineStub:
+    """Minimal local LINE Messaging API: serves image content and records replies.
+
+    Use as a context manager; ``base_url`` points at the running server.
+    """
+
+    def __init__(self, image: bytes, latency: float = 0.0):
+        self.image = image
+        self.latency = latency
+        self.replies = []
+        self.pushes = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, ctype: str):
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if self.path.endswith("/content"):
+                    return self._send(200, stub.image, "image/png")
+                return self._send(404, b"{}", "application/json")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if stub.latency:
+                    time.sleep(stub.latency)
+                with stub._lock:
+                    if self.path.endswith("/reply"):
+                        stub.replies.append((time.perf_counter(), payload))
+                    elif self.path.endswith("/push"):
+                        stub.pushes.append((time.perf_counter(), payload))
+                    else:
+                        return self._send(404, b"{}", "application/json")
+                return self._send(200, b"{}", "application/json")
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def webhook_event(kind: str, i: int, text: str = "", group: str = None) -> dict:
+    """A LINE webhook body with a single message event (from a group chat if ``group`` is set)."""
+    message = {"type": kind, "id": f"msg{i}"}
+    if kind == "text":
+        message["text"] = text
+    source = {"type": "user", "userId": f"U{i % 50:032d}"}
+    if group:
+        source = {"type": "group", "groupId": group, "userId": source["userId"]}
+    return {
+        "destination": "Ubench",
+        "events": [{
+            "type": "message",
+            "webhookEventId": f"evt{i}",
+            "deliveryContext": {"isRedelivery": False},
+            "replyToken": f"token{i}",
+            "source": source,
+            "timestamp": int(time.time() * 1000),
+            "message": message,
+        }],
+    }
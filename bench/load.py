@@ -0,0 +1,193 @@
+"""Replay LINE webhook traffic against the app, with LINE and Gemini faked locally.
+
+Events arrive as a Poisson process at --rate per second for --duration
+seconds: images, slips typed as text, and chat, from a mix of groups and
+1:1 users where a few chats send most of the traffic. The app runs against
+an in-process ``bench.fake_api`` server, so nothing leaves the machine.
+
+    python -m bench.load                                  # 20 events/s for 30 s, fresh app
+    python -m bench.load --rate 50 --workers 4 --gemini-latency 1.5 --gemini-429 0.05
+    python -m bench.load --url http://127.0.0.1:5001 --fake-port 8090
+
+With --url the app must already be running with the environment printed by
+``python -m bench.fake_api --port <fake-port>`` (this driver starts that
+server itself). Reports sustained events/s, webhook latency, and how many
+replies reached LINE within --deadline seconds of the event.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+
+from bench import fake_api, fixtures, run, slips
+
+CHAT = run.CHAT
+
+
+def make_events(rate: float, duration: float, mix: dict, seed: int) -> list:
+    """``(offset seconds, webhook body, kind, expects reply)`` for one run."""
+    rng = random.Random(seed)
+    groups = [f"Cload{g:04d}" for g in range(40)]
+    users = [f"Uload{u:028d}" for u in range(300)]
+    sources = [("group", g) for g in groups] + [("user", u) for u in users]
+    weights = [1 / (rank + 1) for rank in range(len(sources))]  # a few chats send most events
+    rng.shuffle(weights)
+    kinds, kind_weights = zip(*mix.items())
+
+    events, t, i = [], 0.0, 0
+    while True:
+        t += rng.expovariate(rate)
+        if t >= duration:
+            return events
+        source_type, source_id = rng.choices(sources, weights)[0]
+        kind = rng.choices(kinds, kind_weights)[0]
+        text = ""
+        if kind == "slip":
+            text = slips.generate_slip(rng.randint(5, 60), seed=seed * 1_000_003 + i)
+        elif kind == "chat":
+            text = rng.choice(CHAT)
+        body = fixtures.webhook_event("image" if kind == "image" else "text", i, text)
+        event = body["events"][0]
+        event["webhookEventId"] = f"load{seed}-{i}"
+        event["replyToken"] = f"load{seed}-{i}"
+        event["source"] = {"type": source_type, "userId": users[i % len(users)]}
+        if source_type == "group":
+            event["source"]["groupId"] = source_id
+        else:
+            event["source"]["userId"] = source_id
+        # Chat in a group is not answered (see "Chat Messages in Groups")
+        events.append((t, body, kind, not (kind == "chat" and source_type == "group")))
+        i += 1
+
+
+async def replay(base_url: str, events: list, timeout: float) -> list:
+    """Send each event at its offset (open loop); returns per-event results."""
+    import httpx
+    limits = httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as http:
+        for _ in range(300):  # wait for the app to come up
+            try:
+                if (await http.get("/health")).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                await asyncio.sleep(0.1)
+
+        results = [None] * len(events)
+
+        async def one(idx: int, body: dict):
+            sent = time.time()
+            t0 = time.perf_counter()
+            try:
+                resp = await http.post("/webhook", json=body)
+                ok = resp.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            results[idx] = {"sent": sent, "latency": time.perf_counter() - t0, "done": time.time(), "ok": ok}
+
+        start = time.perf_counter()
+        tasks = []
+        for idx, (offset, body, _, _) in enumerate(events):
+            delay = start + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(idx, body)))
+        await asyncio.gather(*tasks)
+    return results
+
+
+def _pct(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def summarize(events: list, results: list, replies: dict, deadline: float) -> dict:
+    expected = on_time = late = missing = slowed = failed = 0
+    for (_, body, kind, expects), res in zip(events, results):
+        if not expects:
+            continue
+        expected += 1
+        reply = replies.get(body["events"][0]["replyToken"])
+        if reply is None:
+            missing += 1
+            continue
+        arrived, first = reply
+        if arrived - res["sent"] <= deadline:
+            on_time += 1
+        else:
+            late += 1
+        if first.startswith("⏳"):
+            slowed += 1
+        elif first.startswith("OCR processing failed"):
+            failed += 1
+    latencies = [r["latency"] for r in results]
+    window = max(r["done"] for r in results) - min(r["sent"] for r in results)
+    return {
+        "events": len(events),
+        "http_errors": sum(not r["ok"] for r in results),
+        "events_per_s": round(len(results) / window, 2),
+        "p50_ms": round(_pct(latencies, 50) * 1000, 1),
+        "p99_ms": round(_pct(latencies, 99) * 1000, 1),
+        "replies_expected": expected,
+        "replied_within_deadline": on_time,
+        "replied_late": late,
+        "no_reply": missing,
+        "within_deadline_rate": round(on_time / expected, 4) if expected else None,
+        "rate_limited": slowed,
+        "ocr_failed": failed,
+        "by_kind": {kind: sum(1 for e in events if e[2] == kind) for kind in ("image", "slip", "chat")},
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rate", type=float, default=20.0, help="events per second offered")
+    ap.add_argument("--duration", type=float, default=30.0, help="seconds of traffic")
+    ap.add_argument("--deadline", type=float, default=20.0, help="seconds from event to reply that count as on time")
+    ap.add_argument("--images", type=float, default=0.3, help="share of image messages")
+    ap.add_argument("--slips", type=float, default=0.3, help="share of slips sent as text (the rest is chat)")
+    ap.add_argument("--workers", type=int, default=1, help="app worker processes (ignored with --url)")
+    ap.add_argument("--url", help="an already running app (started with the fake API environment)")
+    ap.add_argument("--fake-port", type=int, default=0, help="port of the fake LINE + Gemini server")
+    ap.add_argument("--gemini-latency", type=float, default=1.0)
+    ap.add_argument("--gemini-errors", type=float, default=0.0, help="fraction of Gemini calls failing with 500")
+    ap.add_argument("--gemini-429", type=float, default=0.0, help="fraction of Gemini calls rejected with 429")
+    ap.add_argument("--line-latency", type=float, default=0.02)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", help="also write the summary to this file")
+    args = ap.parse_args(argv)
+
+    mix = {"image": args.images, "slip": args.slips, "chat": max(0.0, 1 - args.images - args.slips)}
+    events = make_events(args.rate, args.duration, mix, args.seed)
+    api = fake_api.default_api(gemini_latency=args.gemini_latency, gemini_error_rate=args.gemini_errors,
+                               gemini_429_rate=args.gemini_429, line_latency=args.line_latency,
+                               port=args.fake_port, seed=args.seed)
+    with api, tempfile.TemporaryDirectory() as state_dir:
+        proc = None
+        base_url = args.url
+        if base_url is None:
+            proc, base_url = run._serve_workers(args.workers, state_dir, env=api.app_env())
+        try:
+            print(f"Replaying {len(events)} events ({args.rate}/s for {args.duration:.0f}s) against {base_url}",
+                  file=sys.stderr)
+            results = asyncio.run(replay(base_url, events, timeout=args.deadline * 3))
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait(timeout=30)
+        summary = summarize(events, results, dict(api.replies), args.deadline)
+        summary["fake_api"] = api.stats()
+
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,645 @@
+"""Benchmark runner: throughput, p50/p99 latency and peak RSS per scenario.
+
+Every scenario runs in its own interpreter so peak RSS is attributable to it.
+Results are compared with ``bench/baseline.json`` (keyed by mode, ``full`` or
+``quick``); throughput drops or p99 increases beyond ``--tolerance`` are
+flagged as regressions.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench import fixtures, slips
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# Simulated backend latencies (seconds)
+GEMINI_LATENCY = 0.05
+GEMINI_LONG_LATENCY = 1.0  # generating a long slip's text
+TESSERACT_LATENCY = 0.02  # per call (process start-up)
+TESSERACT_PER_MEGAPIXEL = 0.05
+LINE_LATENCY = 0.002
+
+SCENARIOS = {}
+
+
+def scenario(name: str):
+    def register(fn):
+        SCENARIOS[name] = fn
+        return fn
+    return register
+
+
+def _app():
+    """Import the app with its outbound dependencies replaced by local fakes."""
+    import app as appmod
+    appmod.api_key = "bench-key"  # force the Gemini-first path (served by the fake)
+    appmod.slip_store = _slip_store(appmod)  # keep stored slips out of the working tree
+    return appmod
+
+
+def _timed(fn, repeat: int) -> list:
+    latencies = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+# ----------------------------- calculation engine ----------------------------- #
+
+def _parse(n_lines: int, repeat: int):
+    appmod = _app()
+    appmod.calc_cache = appmod.CalcCache(0, 0)  # measure the engine, not the memo
+    text = slips.generate_slip(n_lines, seed=n_lines)
+    appmod.compute_from_text(text)  # warm-up
+    lat = _timed(lambda: appmod.compute_from_text(text), repeat)
+    return {"latencies": lat, "work": n_lines * repeat, "unit": "lines"}
+
+
+@scenario("parse-10")
+def parse_10(quick: bool):
+    return _parse(10, 500 if quick else 5000)
+
+
+@scenario("parse-1k")
+def parse_1k(quick: bool):
+    return _parse(1000, 20 if quick else 200)
+
+
+@scenario("parse-100k")
+def parse_100k(quick: bool):
+    return _parse(10_000 if quick else 100_000, 2 if quick else 5)
+
+
+@scenario("parse-repeat")
+def parse_repeat(quick: bool):
+    """The same 1k-line slip again (a forwarded image, a re-uploaded PDF): whole-slip cache hits."""
+    appmod = _app()
+    text = slips.generate_slip(1000, seed=1000)
+    appmod.compute_from_text(text)
+    repeat = 200 if quick else 2000
+    lat = _timed(lambda: appmod.compute_from_text(text), repeat)
+    return {"latencies": lat, "work": 1000 * repeat, "unit": "lines"}
+
+
+@scenario("parse-edit")
+def parse_edit(quick: bool):
+    """A 1k-line slip with one line corrected each time: only that line's section is recomputed."""
+    appmod = _app()
+    lines = slips.generate_slip(1000, seed=1000).split("\n")
+    appmod.compute_from_text("\n".join(lines))
+    repeat = 50 if quick else 500
+    edits = iter(range(1, repeat + 1))
+
+    def edit():
+        i = next(edits)
+        lines[-1] = f"{i % 1000:03d} × {i % 50 + 1}"
+        appmod.compute_from_text("\n".join(lines))
+
+    lat = _timed(edit, repeat)
+    return {"latencies": lat, "work": 1000 * repeat, "unit": "lines"}
+
+
+def _reconcile(batch: bool, quick: bool):
+    appmod = _app()
+    appmod.calc_cache = appmod.CalcCache(0, 0)
+    texts = slips.generate_day(200 if quick else 2000, lines_per_slip=40, seed=8)
+    n_lines = sum(len(t.splitlines()) for t in texts)
+    if batch:
+        appmod.compute_batch(texts[:10])  # warm-up (builds the permutation tables)
+        run = lambda: appmod.compute_batch(texts)
+    else:
+        run = lambda: [appmod.compute_from_text(t)["grand_total"] for t in texts]
+    repeat = 3 if quick else 5
+    lat = _timed(run, repeat)
+    return {"latencies": lat, "work": n_lines * repeat, "unit": "lines"}
+
+
+@scenario("reconcile-scalar")
+def reconcile_scalar(quick: bool):
+    return _reconcile(False, quick)
+
+
+@scenario("reconcile-batch")
+def reconcile_batch(quick: bool):
+    return _reconcile(True, quick)
+
+
+# ----------------------------- OCR pipeline ----------------------------- #
+
+@scenario("ocr-gemini")
+def ocr_gemini(quick: bool):
+    appmod = _app()
+    text = slips.generate_slip(60, seed=1)
+    appmod.client = fixtures.FakeGeminiClient(text, latency=GEMINI_LATENCY)
+    image = fixtures.make_slip_image(text)
+    n = 10 if quick else 50
+    lat = _timed(lambda: appmod.extract_text_from_image(image), n)
+    return {"latencies": lat, "work": n, "unit": "images"}
+
+
+def _gemini_long(quick: bool, streaming: bool, first_subtotal: bool = False):
+    """OCR + calculation of a long slip; latency is to the end, or to the first section subtotal."""
+    appmod = _app()
+    appmod.GEMINI_STREAMING = streaming
+    text = slips.generate_slip(1000 if quick else 3000, seed=11)
+    appmod.client = fixtures.FakeGeminiClient(text, latency=GEMINI_LONG_LATENCY, chunk_lines=10)
+    image = fixtures.make_slip_image(text[:2000])
+
+    def run():
+        appmod.calc_cache.clear()
+        t0 = time.perf_counter()
+        first = []
+        on_section = lambda section: first or first.append(time.perf_counter() - t0)
+        ocr_text = appmod.extract_text_from_image(image, on_section=on_section)
+        appmod.compute_from_text(ocr_text)
+        return first[0] if first_subtotal and first else time.perf_counter() - t0
+
+    n = 3 if quick else 10
+    lat = [run() for _ in range(n)]
+    return {"latencies": lat, "work": n, "unit": "images"}
+
+
+@scenario("ocr-gemini-long")
+def ocr_gemini_long(quick: bool):
+    return _gemini_long(quick, streaming=False)
+
+
+@scenario("ocr-gemini-stream")
+def ocr_gemini_stream(quick: bool):
+    return _gemini_long(quick, streaming=True)
+
+
+@scenario("ocr-gemini-stream-first")
+def ocr_gemini_stream_first(quick: bool):
+    """Time to the first section subtotal while the response is still streaming.
+
+    Measured at the on_section hook; the webhook and /upload still answer
+    once, with the whole result.
+    """
+    return _gemini_long(quick, streaming=True, first_subtotal=True)
+
+
+@scenario("ocr-tesseract-tall")
+def ocr_tesseract_tall(quick: bool):
+    appmod = _app()
+    text = slips.generate_slip(300, seed=2)
+    appmod.client = fixtures.FakeGeminiClient(text, fail=True)
+    appmod.TESSERACT_PROFILE = "slip"
+    fixtures.FakeTesseract(text, latency=TESSERACT_LATENCY, per_megapixel=TESSERACT_PER_MEGAPIXEL).install(appmod.pytesseract)
+    image = fixtures.make_slip_image(text, scale=2)
+    n = 3 if quick else 10
+    lat = _timed(lambda: appmod.extract_text_from_image(image), n)
+    return {"latencies": lat, "work": n, "unit": "images"}
+
+
+@scenario("pdf-text")
+def pdf_text(quick: bool):
+    appmod = _app()
+    pages = 20 if quick else 300
+    pdf = fixtures.make_text_pdf(pages, slips.generate_slip(pages * 40, seed=3, headlines=slips.ASCII_HEADLINES))
+    n = 3 if quick else 5
+    lat = _timed(lambda: appmod.extract_text_from_pdf(pdf), n)
+    return {"latencies": lat, "work": pages * n, "unit": "pages"}
+
+
+@scenario("pdf-mixed")
+def pdf_mixed(quick: bool):
+    appmod = _app()
+    text = slips.generate_slip(400, seed=4, headlines=slips.ASCII_HEADLINES)
+    appmod.client = fixtures.FakeGeminiClient(text[:2000], latency=GEMINI_LATENCY)
+    pdf = fixtures.make_mixed_pdf(8, 2, text) if quick else fixtures.make_mixed_pdf(40, 10, text)
+    pages = 10 if quick else 50
+    n = 2 if quick else 3
+    lat = _timed(lambda: appmod.extract_text_from_pdf(pdf), n)
+    return {"latencies": lat, "work": pages * n, "unit": "pages"}
+
+
+# ----------------------------- slip store ----------------------------- #
+
+def _slip_store(appmod):
+    return appmod.SlipStore(os.path.join(tempfile.mkdtemp(prefix="bench-store-"), "slips.sqlite3"))
+
+
+def _fill_store(store, texts: list):
+    for i, text in enumerate(texts):
+        store.record(text, "line", f"U{i % 500:032d}", None)
+        if i % 1000 == 999:
+            store.flush()  # stay under the queue limit
+    store.flush()
+
+
+@scenario("store-write")
+def store_write(quick: bool):
+    appmod = _app()
+    store = _slip_store(appmod)
+    texts = slips.generate_day(2000 if quick else 10_000, lines_per_slip=40, seed=9)
+    t0 = time.perf_counter()
+    _fill_store(store, texts)
+    wall = time.perf_counter() - t0
+    return {"latencies": [wall], "work": sum(len(t.splitlines()) for t in texts), "unit": "lines", "wall": wall}
+
+
+@scenario("store-query")
+def store_query(quick: bool):
+    """Report queries over a store holding ~100k (quick) / ~1M lines spread over 30 days."""
+    appmod = _app()
+    store = _slip_store(appmod)
+    texts = slips.generate_day(2500 if quick else 25_000, lines_per_slip=40, seed=10)
+    now = time.time()
+    for i, text in enumerate(texts):
+        store.record(text, "line", f"U{i % 500:032d}", None, created_at=now - (i % 30) * 86400)
+        if i % 1000 == 999:
+            store.flush()  # stay under the queue limit
+    store.flush()
+    start, end = appmod._day(now - 29 * 86400), appmod._day(now)
+    queries = [
+        lambda: store.daily_totals(start, end),
+        lambda: store.hot_numbers(start, end, 20),
+        lambda: store.hot_numbers(end, end, 20),
+        lambda: store.user_summaries(start, end, 20),
+        lambda: store.user_summaries(start, end, 20, "U" + "7".zfill(32)),
+    ]
+    repeat = 20 if quick else 50
+    lat = _timed(lambda: [q() for q in queries], repeat)
+    return {"latencies": lat, "work": len(queries) * repeat, "unit": "queries"}
+
+
+# ----------------------------- JSON ----------------------------- #
+
+def _json(fast: bool, quick: bool):
+    """Build a large /upload response and parse a large /reconcile request body."""
+    from fasthtml.core import JSONResponse as StdJSONResponse
+    appmod = _app()
+    text = slips.generate_slip(2000 if quick else 20_000, seed=11)
+    calc = appmod.compute_from_text(text)
+    response = {"success": True, "text": text, "calc": calc["report"], "grand_total": calc["grand_total"]}
+    body = json.dumps({"slips": slips.generate_day(100 if quick else 1000, seed=11)}).encode()
+    cls, parse = (appmod.FastJSONResponse, appmod.json_parse) if fast else (StdJSONResponse, json.loads)
+    # Slips can total more than 64 bits; those values must round-trip exactly
+    oversized = {"grand_total": 99999999999999999999, "subtotals": [-2 ** 70, 5]}
+    assert json.loads(cls(oversized).body) == oversized and parse(json.dumps(oversized).encode()) == oversized
+    size = len(cls(response).body) + len(body)
+    repeat = 20 if quick else 50
+    lat = _timed(lambda: (cls(response), parse(body)), repeat)
+    return {"latencies": lat, "work": size * repeat / 1e6, "unit": "MB"}
+
+
+@scenario("json-stdlib")
+def json_stdlib(quick: bool):
+    return _json(False, quick)
+
+
+@scenario("json-fast")
+def json_fast(quick: bool):
+    return _json(True, quick)
+
+
+# ----------------------------- HTTP routes ----------------------------- #
+
+async def _drive(appmod, requests: list, concurrency: int) -> list:
+    """Send (method, path, kwargs) requests through the ASGI app with bounded concurrency."""
+    import httpx
+    sem = asyncio.Semaphore(concurrency)
+    latencies = []
+    transport = httpx.ASGITransport(app=appmod.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as http:
+        async def one(method, path, kwargs):
+            async with sem:
+                t0 = time.perf_counter()
+                resp = await http.request(method, path, **kwargs)
+                latencies.append(time.perf_counter() - t0)
+                resp.raise_for_status()
+        await asyncio.gather(*(one(*r) for r in requests))
+        # Follow-up pushes run in the background; let them finish inside the loop
+        await asyncio.gather(*list(appmod._push_tasks))
+    return latencies
+
+
+def _http(requests: list, concurrency: int, appmod) -> dict:
+    t0 = time.perf_counter()
+    lat = asyncio.run(_drive(appmod, requests, concurrency))
+    return {"latencies": lat, "work": len(requests), "unit": "requests", "wall": time.perf_counter() - t0}
+
+
+def _point_at_stub(appmod, stub):
+    appmod.LINE_REPLY_URL = stub.base_url + "/v2/bot/message/reply"
+    appmod.LINE_PUSH_URL = stub.base_url + "/v2/bot/message/push"
+    appmod.LINE_CONTENT_URL = stub.base_url + "/v2/bot/message/{messageId}/content"
+
+
+@scenario("http-upload")
+def http_upload(quick: bool):
+    appmod = _app()
+    text = slips.generate_slip(80, seed=5)
+    appmod.client = fixtures.FakeGeminiClient(text, latency=GEMINI_LATENCY)
+    image = fixtures.make_slip_image(text)
+    n = 16 if quick else 64
+    reqs = [("POST", "/upload", {"files": {"file": ("slip.png", image, "image/png")}}) for _ in range(n)]
+    return _http(reqs, 8, appmod)
+
+
+@scenario("http-compute-edit")
+def http_compute_edit(quick: bool):
+    """One-line corrections to a long slip through /compute's incremental mode."""
+    appmod = _app()
+    n_lines = 2000 if quick else 20_000
+    session = appmod.ComputeSession(slips.generate_slip(n_lines, seed=6))
+    appmod.compute_sessions.put(session.id, session)
+    rng = random.Random(6)
+    n = 50 if quick else 300
+    reqs = []
+    for version in range(n):
+        line = rng.randrange(n_lines)
+        edit = {"start": line, "end": line + 1, "lines": [slips.slip_line(rng)]}
+        reqs.append(("POST", "/compute", {"json": {"session": session.id, "version": version, "edits": [edit]}}))
+    return _http(reqs, 1, appmod)
+
+
+@scenario("http-webhook-text")
+def http_webhook_text(quick: bool):
+    appmod = _app()
+    n = 50 if quick else 300
+    with fixtures.LineStub(b"", latency=LINE_LATENCY) as stub:
+        _point_at_stub(appmod, stub)
+        reqs = [("POST", "/webhook", {"json": fixtures.webhook_event("text", i, slips.generate_slip(30, seed=i))})
+                for i in range(n)]
+        result = _http(reqs, 16, appmod)
+        result["replies"] = len(stub.replies)
+    return result
+
+
+CHAT = ["ok", "thanks ครับ", "ส่งแล้วนะ", "see you at 5pm", "ยอดเมื่อวาน 1200 บาท", "555", "รับทราบ"]
+
+
+@scenario("http-webhook-chat")
+def http_webhook_chat(quick: bool):
+    """A group chat where one message in five is a slip; chat gets no reply."""
+    appmod = _app()
+    n = 100 if quick else 600
+    rng = random.Random(7)
+    with fixtures.LineStub(b"", latency=LINE_LATENCY) as stub:
+        _point_at_stub(appmod, stub)
+        reqs = []
+        for i in range(n):
+            text = slips.generate_slip(30, seed=i) if i % 5 == 0 else rng.choice(CHAT)
+            reqs.append(("POST", "/webhook", {"json": fixtures.webhook_event("text", i, text, group="Cbench")}))
+        result = _http(reqs, 16, appmod)
+        result["replies"] = len(stub.replies)
+        result["skipped"] = appmod.slip_filter.skipped_text
+    return result
+
+
+@scenario("http-webhook-long")
+def http_webhook_long(quick: bool):
+    """1k-line slips: a totals summary is replied and the full report pushed in 5-message batches."""
+    appmod = _app()
+    appmod.REPORT_PUSH_MAX_MESSAGES = 50  # a 1k-line report is ~30 messages, above the default cap
+    n = 10 if quick else 50
+    with fixtures.LineStub(b"", latency=LINE_LATENCY) as stub:
+        _point_at_stub(appmod, stub)
+        reqs = [("POST", "/webhook", {"json": fixtures.webhook_event("text", i, slips.generate_slip(1000, seed=i))})
+                for i in range(n)]
+        result = _http(reqs, 4, appmod)
+        result["replies"] = len(stub.replies)
+        result["pushes"] = len(stub.pushes)
+    return result
+
+
+@scenario("http-webhook-fair")
+def http_webhook_fair(quick: bool):
+    """A group floods 30 images while single users send one each: the users' reply latency.
+
+    The group's burst is admitted, the rest get the immediate slow-down reply;
+    users are queued ahead of the group's backlog for the 2 OCR slots.
+    """
+    import httpx
+    appmod = _app()
+    appmod.ocr_queue = appmod.FairOcrQueue(2)
+    text = slips.generate_slip(40, seed=9)
+    appmod.client = fixtures.FakeGeminiClient(text, latency=0.2)
+    rounds = 1 if quick else 4
+    with fixtures.LineStub(fixtures.make_slip_image(text), latency=LINE_LATENCY) as stub:
+        _point_at_stub(appmod, stub)
+
+        async def run():
+            transport = httpx.ASGITransport(app=appmod.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as http:
+                async def send(i, group=None):
+                    t0 = time.perf_counter()
+                    resp = await http.post("/webhook", json=fixtures.webhook_event("image", i, group=group))
+                    resp.raise_for_status()
+                    return time.perf_counter() - t0
+
+                latencies = []
+                for r in range(rounds):
+                    flood = [asyncio.create_task(send(r * 1000 + i, group=f"Cflood{r}")) for i in range(30)]
+                    await asyncio.sleep(0.05)
+                    users = [send(r * 1000 + 100 + i) for i in range(10)]
+                    latencies += await asyncio.gather(*users)
+                    await asyncio.gather(*flood)
+                return latencies
+
+        t0 = time.perf_counter()
+        lat = asyncio.run(run())
+        wall = time.perf_counter() - t0
+    return {"latencies": lat, "work": len(lat), "unit": "user images", "wall": wall,
+            "replies": len(stub.replies), "skipped": appmod.ocr_queue.rejected}
+
+
+@scenario("http-webhook-image")
+def http_webhook_image(quick: bool):
+    appmod = _app()
+    text = slips.generate_slip(80, seed=6)
+    appmod.client = fixtures.FakeGeminiClient(text, latency=GEMINI_LATENCY)
+    n = 16 if quick else 64
+    with fixtures.LineStub(fixtures.make_slip_image(text), latency=LINE_LATENCY) as stub:
+        _point_at_stub(appmod, stub)
+        reqs = [("POST", "/webhook", {"json": fixtures.webhook_event("image", i)}) for i in range(n)]
+        result = _http(reqs, 8, appmod)
+        result["replies"] = len(stub.replies)
+    return result
+
+
+def _serve_workers(workers: int, state_dir: str, env: dict = None, log: bool = False):
+    """Start the app under uvicorn with ``workers`` processes on a free local port."""
+    import socket
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        free_port = sock.getsockname()[1]
+    env = {**os.environ, **(env or {}), "WORKERS": str(workers), "STATE_DIR": state_dir}
+    code = (f"import uvicorn; uvicorn.run('app:app', host='127.0.0.1', port={free_port}, "
+            f"workers={workers}, log_level='warning')")
+    out = None if log else subprocess.DEVNULL
+    proc = subprocess.Popen([sys.executable, "-c", code], cwd=ROOT, env=env, stdout=out, stderr=out)
+    return proc, f"http://127.0.0.1:{free_port}"
+
+
+async def _drive_tcp(base_url: str, requests: list, concurrency: int):
+    """Like ``_drive`` but over TCP; returns (latencies, wall time excluding server start-up)."""
+    import httpx
+    async with httpx.AsyncClient(base_url=base_url, timeout=5) as http:
+        for _ in range(300):  # wait for the workers to come up
+            try:
+                if (await http.get("/health")).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                await asyncio.sleep(0.1)
+    sem = asyncio.Semaphore(concurrency)
+    latencies = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as http:
+        async def one(method, path, kwargs):
+            async with sem:
+                t0 = time.perf_counter()
+                resp = await http.request(method, path, **kwargs)
+                latencies.append(time.perf_counter() - t0)
+                resp.raise_for_status()
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one(*r) for r in requests))
+    return latencies, time.perf_counter() - t0
+
+
+def _pdf_upload_workers(workers: int, quick: bool) -> dict:
+    """CPU-bound /upload traffic (text PDFs: extraction + parsing) against real worker processes."""
+    pages = 10 if quick else 40
+    pdf = fixtures.make_text_pdf(pages, slips.generate_slip(pages * 40, seed=7, headlines=slips.ASCII_HEADLINES))
+    n = 8 * workers if quick else 32 * workers
+    reqs = [("POST", "/upload", {"files": {"file": ("slip.pdf", pdf, "application/pdf")}}) for _ in range(n)]
+    with tempfile.TemporaryDirectory() as state_dir:
+        proc, base_url = _serve_workers(workers, state_dir)
+        try:
+            lat, wall = asyncio.run(_drive_tcp(base_url, reqs, 2 * workers))
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+    return {"latencies": lat, "work": n, "unit": "requests", "wall": wall}
+
+
+@scenario("workers-1")
+def workers_1(quick: bool):
+    return _pdf_upload_workers(1, quick)
+
+
+@scenario("workers-all")
+def workers_all(quick: bool):
+    """Same load as ``workers-1`` with one worker per core; compare the throughputs for scaling."""
+    return _pdf_upload_workers(os.cpu_count() or 1, quick)
+
+
+# ----------------------------- runner ----------------------------- #
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[k]
+
+
+def _peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_child(name: str, quick: bool, out: str):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        raw = SCENARIOS[name](quick)
+    lat = raw["latencies"]
+    # Sequential scenarios are timed per call; concurrent ones report their own wall time
+    wall = raw.get("wall", sum(lat))
+    result = {
+        "unit": raw["unit"],
+        "throughput": round(raw["work"] / wall if wall else 0.0, 3),
+        "p50_ms": round(_percentile(lat, 50) * 1000, 3),
+        "p99_ms": round(_percentile(lat, 99) * 1000, 3),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "samples": len(lat),
+    }
+    for key in ("replies", "pushes", "skipped"):
+        if key in raw:
+            result[key] = raw[key]
+    Path(out).write_text(json.dumps(result))
+
+
+def run_isolated(name: str, quick: bool) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "result.json")
+        cmd = [sys.executable, "-m", "bench.run", "--child", name, "--out", out] + (["--quick"] if quick else [])
+        proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+        if proc.returncode != 0:
+            return {"error": (proc.stderr or proc.stdout).strip().splitlines()[-1:]}
+        return json.loads(Path(out).read_text())
+
+
+def compare(result: dict, base: dict, tolerance: float) -> str:
+    if not base or "error" in result or "error" in base:
+        return ""
+    notes = []
+    if base.get("throughput"):
+        delta = (result["throughput"] - base["throughput"]) / base["throughput"]
+        notes.append(f"thr {delta:+.0%}")
+        if delta < -tolerance:
+            notes.append("REGRESSION")
+    if base.get("p99_ms"):
+        delta = (result["p99_ms"] - base["p99_ms"]) / base["p99_ms"]
+        notes.append(f"p99 {delta:+.0%}")
+        if delta > tolerance and "REGRESSION" not in notes:
+            notes.append("REGRESSION")
+    return " ".join(notes)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--only", action="append", choices=sorted(SCENARIOS), help="run only these scenarios")
+    ap.add_argument("--quick", action="store_true", help="smaller inputs and fewer repetitions")
+    ap.add_argument("--save-baseline", action="store_true", help="store results as the baseline for this mode")
+    ap.add_argument("--tolerance", type=float, default=0.15, help="relative change flagged as a regression")
+    ap.add_argument("--fail-on-regression", action="store_true", help="exit 1 when a regression is flagged")
+    ap.add_argument("--child", help=argparse.SUPPRESS)
+    ap.add_argument("--out", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        run_child(args.child, args.quick, args.out)
+        return 0
+
+    mode = "quick" if args.quick else "full"
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    base_mode = baseline.get(mode, {})
+    names = args.only or list(SCENARIOS)
+    results = {}
+    regressions = 0
+    print(f"{'scenario':<22}{'throughput':>22}{'p50 ms':>10}{'p99 ms':>10}{'RSS MB':>9}  vs baseline")
+    for name in names:
+        res = run_isolated(name, args.quick)
+        results[name] = res
+        if "error" in res:
+            print(f"{name:<22}  ERROR {res['error']}")
+            continue
+        cmp = compare(res, base_mode.get(name), args.tolerance)
+        regressions += "REGRESSION" in cmp
+        thr = f"{res['throughput']:,.1f} {res['unit']}/s"
+        print(f"{name:<22}{thr:>22}{res['p50_ms']:>10.2f}{res['p99_ms']:>10.2f}{res['peak_rss_mb']:>9.1f}  {cmp}")
+
+    if args.save_baseline:
+        baseline[mode] = {**base_mode, **{k: v for k, v in results.items() if "error" not in v}}
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline ({mode}) saved to {BASELINE_PATH}")
+    return 1 if (regressions and args.fail_on_regression) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Synthetic slip generators.
+
+Slips mix every line shape the calculation engine understands (headlines,
+groups, Format A/B/C, flat values) plus a little noise, deterministically
+from a seed so that runs are comparable.
+"""
+import random
+
+FULL_TB = ["บนล่าง", "บล", "บ/ล", "บน+ล่าง", "บ+ล", "บ-ล", "บน-ล่าง", "ล่างบน"]
+SINGLE = ["บน", "ล่าง"]
+ASCII_HEADLINES = ["TOP", "BOTTOM"]  # for PDFs rendered with base-14 fonts (no Thai glyphs)
+
+NOISE = ["ok", "thanks", "รวม", "--", "total?"]
+
+
+def _number(rng: random.Random) -> str:
+    n = rng.choice((3, 3, 3, 4, 4, 2))
+    return "".join(rng.choice("0123456789") for _ in range(n))
+
+
+def slip_line(rng: random.Random) -> str:
+    """One non-headline line in a random supported (or occasionally unsupported) shape."""
+    kind = rng.random()
+    if kind < 0.30:  # Format B: ABC × Y
+        return f"{_number(rng)} × {rng.randint(1, 200)}"
+    if kind < 0.45:  # Format A: ABC = X × Y
+        return f"{_number(rng)} = {rng.randint(1, 200)} × {rng.randint(1, 50)}"
+    if kind < 0.55:  # Format C: ABC × Y = B
+        return f"{_number(rng)} × {rng.randint(1, 50)} = {rng.randint(1, 20)}"
+    if kind < 0.75:  # flat value, including two-digit numbers
+        return f"{_number(rng)} = {rng.randint(1, 500)}"
+    if kind < 0.85:  # group, explicit value
+        items = ", ".join(_number(rng) for _ in range(rng.randint(2, 6)))
+        return f"{{{items}}} = {rng.randint(1, 100)}"
+    if kind < 0.95:  # group, = X × Y
+        items = ", ".join(_number(rng) for _ in range(rng.randint(2, 6)))
+        return f"{{{items}}} = {rng.randint(1, 100)} × {rng.randint(1, 20)}"
+    return rng.choice(NOISE)
+
+
+def generate_slip(n_lines: int, seed: int = 0, headlines=None, section_len: int = 25) -> str:
+    """Return slip text with roughly ``n_lines`` lines, a headline every ~``section_len`` lines."""
+    rng = random.Random(seed)
+    heads = headlines or (FULL_TB + SINGLE)
+    out = []
+    while len(out) < n_lines:
+        if not out or rng.random() < 1.0 / section_len:
+            out.append(rng.choice(heads))
+            continue
+        out.append(slip_line(rng))
+    return "\n".join(out[:n_lines])
+
+
+def generate_day(n_slips: int, lines_per_slip: int = 40, seed: int = 0) -> list:
+    """A day's worth of slips of varying length."""
+    rng = random.Random(seed)
+    return [
+        generate_slip(max(1, int(rng.gauss(lines_per_slip, lines_per_slip / 3))), seed=seed * 100003 + i)
+        for i in range(n_slips)
+    ]
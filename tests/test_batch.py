@@ -0,0 +1,54 @@
+"""compute_batch must agree with compute_from_text, line by line and in every aggregate.
+
+Randomized slips come from bench.check_batch (which runs the same comparison
+on large seeds); the cases below pin the int64 edges of the columnar engine.
+"""
+import random
+
+import pytest
+
+import app
+from bench.check_batch import EDGE_SLIPS, compare, salted_slip
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_slips_match_scalar_engine(seed):
+    rng = random.Random(seed)
+    texts = [salted_slip(rng, seed * 1_000_003 + i) for i in range(150)]
+    assert compare(texts) == []
+
+
+def test_values_beyond_int64_fall_back_to_python_ints():
+    cols = app._batch_columns(EDGE_SLIPS)
+    finals, item_amounts = app._batch_finals(cols)
+    assert finals.dtype == object and item_amounts.dtype == object
+    assert compare(EDGE_SLIPS) == []
+    assert app.compute_batch(["123 = 99999999999999999999"])["grand_total"] == 99999999999999999999
+
+
+def test_int64_fast_path_for_ordinary_slips():
+    finals, _ = app._batch_finals(app._batch_columns(["123 × 5\n45 = 3\n{12, 345} = 2 × 3"]))
+    assert finals.dtype == app.np.int64
+
+
+def test_aggregates_are_additive_across_slips():
+    rng = random.Random(42)
+    texts = [salted_slip(rng, 4200 + i) for i in range(40)] + EDGE_SLIPS
+    together = app.compute_batch(texts)
+    by_number, by_headline, unattributed = {}, {}, 0
+    for text in texts:
+        alone = app.compute_batch([text])
+        for number, total in alone["by_number"].items():
+            by_number[number] = by_number.get(number, 0) + total
+        for headline, total in alone["by_headline"].items():
+            by_headline[headline] = by_headline.get(headline, 0) + total
+        unattributed += alone["unattributed"]
+    assert together["by_number"] == by_number
+    assert together["by_headline"] == by_headline
+    assert together["unattributed"] == unattributed
+
+
+def test_group_lines_count_towards_each_item():
+    result = app.compute_batch(["{123, 456} = 10"])
+    assert result["by_number"] == {"123": 10, "456": 10}
+    assert sum(result["by_number"].values()) == result["grand_total"]